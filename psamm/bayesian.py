@@ -18,22 +18,22 @@
 
 """Calculate model mapping likelihood with bayesian."""
 from __future__ import print_function, division
-from future.utils import itervalues
+from future.utils import iteritems, itervalues
 
 from builtins import object, range
 from itertools import product
 from multiprocessing import Pool
-import operator
+import math
 import sys
 import re
-from collections import namedtuple
+from collections import Counter, namedtuple
 
 import numpy as np
 import pandas as pd
+from scipy.special import expit
 
 import psamm.bayesian_util as util
 from psamm.formula import Formula
-from functools import reduce
 
 
 CompoundEntry = namedtuple(
@@ -189,15 +189,8 @@ class BayesianCompoundPredictor(object):
     def get_best_map(self, threshold_compound=0):
         """Return :class:`pandas.DataFrame` style of best mapping for each
         query."""
-        raw_map = self.get_raw_map()
-        query = [i for i, j in raw_map.index.values]
-        # use rank instead of idxmax to output multiple top-hitts
-        best_index = raw_map.iloc[:, 0].groupby(query).rank(
-            method='min', ascending=False).loc[lambda x: x == 1].index.values
-        compound_best = raw_map.loc[best_index]
-        compound_best.query(
-            'p >= @threshold_compound', inplace=True)
-        return compound_best
+        return _best_rows(self.get_raw_map(),
+                          len(self._model1.compounds), threshold_compound)
 
     def get_cpd_pred(self, threshold_compound=0):
         """Return the cpd_pred used for reaction mapping."""
@@ -250,15 +243,22 @@ class BayesianReactionPredictor(object):
 
     def get_best_map(self, threshold_reaction=0):
         """Return pandas.DataFrame style of best mapping for each query."""
-        raw_map = self.get_raw_map()
-        query = [i for i, j in raw_map.index.values]
-        # use rank instead of idxmax to output multiple top-hitts
-        best_index = raw_map.iloc[:, 0].groupby(query).rank(
-            method='min', ascending=False).loc[lambda x: x == 1].index.values
-        reaction_best = raw_map.loc[best_index]
-        reaction_best.query(
-            'p >= @threshold_reaction', inplace=True)
-        return reaction_best
+        return _best_rows(self.get_raw_map(),
+                          len(self._model1.reactions), threshold_reaction)
+
+
+def _best_rows(raw_map, n_query, threshold):
+    """Select the rows that are the best hit for their query entry.
+
+    The raw map covers the full (query, target) product, so the per-query
+    maxima can be found on a reshaped matrix view of the posterior column
+    instead of a pandas groupby/rank pass. Like rank(method='min'), ties
+    for the top score are all kept.
+    """
+    scores = raw_map.iloc[:, 0].to_numpy().reshape(n_query, -1)
+    best = scores == scores.max(axis=1, keepdims=True)
+    mask = (best & (scores >= threshold)).ravel()
+    return raw_map.loc[mask]
 
 
 def compound_id_likelihood(c1, c2, compound_prior, compound_id_marg):
@@ -399,52 +399,94 @@ def reaction_name_likelihood(r1, r2, reaction_prior, reaction_name_marg):
     return p_match, p_no_match
 
 
+# Log-probabilities of a compound without a mapped partner under the
+# match and no-match hypotheses, hoisted out of the per-pair loop.
+_LOG_UNMATCHED_MATCH = math.log(0.1)
+_LOG_UNMATCHED_NO_MATCH = math.log(0.9)
+
+# Cache of name multisets per compound set. The sets coming out of
+# get_cpd_set are frozensets (which cache their hash), so the multiset of
+# compound names per equation side is derived once per reaction instead
+# of once per reaction pair.
+_NAME_COUNT_CACHE = {}
+
+
+def _name_counts(cpd_set):
+    if not isinstance(cpd_set, frozenset):
+        # mutable sets cannot key the cache
+        return Counter(c.name for c in cpd_set)
+    counts = _NAME_COUNT_CACHE.get(cpd_set)
+    if counts is None:
+        counts = Counter(c.name for c in cpd_set)
+        if len(_NAME_COUNT_CACHE) >= _CPD_SET_CACHE_SIZE:
+            _NAME_COUNT_CACHE.clear()
+        _NAME_COUNT_CACHE[cpd_set] = counts
+    return counts.copy()
+
+
 def reaction_equation_mapping_approx_max_likelihood(
         cpd_set1, cpd_set2, cpd_pred, compartment_map={}):
-    """Calculate equation likelihood based on compound mapping."""
+    """Calculate equation log-likelihood based on compound mapping.
+
+    Returns the pair (log p_match, log p_no_match); the result is kept in
+    log-space so that callers can combine partial likelihoods by addition
+    without underflow on long equations.
+    """
+    if not cpd_set1 and not cpd_set2:
+        # nothing to map on either side; both hypotheses observe
+        # likelihood 1
+        return 0.0, 0.0
+
     p_match = 0.0
     p_no_match = 0.0
 
-    # get the possible best-match pairs
-    pair_list = list(set(
-        (c1.name, c2.name)
-        for c1, c2 in product(cpd_set1, cpd_set2)
-        if ((c1.name, c2.name) in cpd_pred.index
-            and (compartment_map.get(c1.compartment, c1.compartment)
-                 == c2.compartment))))
+    # get the possible best-match pairs with their mapping scores
+    scores = {}
+    for c1, c2 in product(cpd_set1, cpd_set2):
+        pair = (c1.name, c2.name)
+        if (pair not in scores
+                and (compartment_map.get(c1.compartment, c1.compartment)
+                     == c2.compartment)):
+            score = cpd_pred.get(pair)
+            if score is not None:
+                scores[pair] = score
 
     # remove the compartment information
-    cpd_set1 = [c.name for c in cpd_set1]
-    cpd_set2 = [c.name for c in cpd_set2]
-
-    # get the p value for (c1, c2) pairs, high possibility first
-    cpd_pred = (cpd_pred.loc[pair_list]
-                .sort_values(ascending=False))
-
-    if (len(cpd_pred) > 0):  # if best-hit pairs exist
-        for c1, c2 in cpd_pred.index.values:
-            if (c1 in cpd_set1) and (c2 in cpd_set2):
-                score = cpd_pred[(c1, c2)]
-                # the possibility that compounds are equal
-                p_match += np.log(score * 0.9 + (1 - score) * 0.1)
-                p_no_match += np.log(score * 0.1 + (1 - score) * 0.9)
-                cpd_set1.remove(c1)
-                cpd_set2.remove(c2)
-
-    for c in cpd_set1:
-        p_match += np.log(0.1)
-        p_no_match += np.log(0.9)
-    for c in cpd_set2:
-        p_match += np.log(0.1)
-        p_no_match += np.log(0.9)
-
-    p_match = np.exp(p_match)
-    p_no_match = np.exp(p_no_match)
+    remaining1 = _name_counts(cpd_set1)
+    remaining2 = _name_counts(cpd_set2)
+
+    # assign the p values to (c1, c2) pairs, high possibility first
+    for (c1, c2), score in sorted(
+            iteritems(scores), key=lambda item: item[1], reverse=True):
+        if remaining1[c1] > 0 and remaining2[c2] > 0:
+            # the possibility that compounds are equal
+            p_match += math.log(score * 0.9 + (1 - score) * 0.1)
+            p_no_match += math.log(score * 0.1 + (1 - score) * 0.9)
+            remaining1[c1] -= 1
+            remaining2[c2] -= 1
+
+    unmatched = sum(remaining1.values()) + sum(remaining2.values())
+    p_match += unmatched * _LOG_UNMATCHED_MATCH
+    p_no_match += unmatched * _LOG_UNMATCHED_NO_MATCH
+
     return p_match, p_no_match
 
 
+def _cpd_pred_dict(cpd_pred):
+    """Return the compound mapping scores as a plain dict of pairs.
+
+    Dict lookups are much cheaper than pandas index lookups inside the
+    per-reaction-pair equation likelihood, and the dict also pickles
+    faster when dispatched to pool workers.
+    """
+    if isinstance(cpd_pred, dict):
+        return cpd_pred
+    return cpd_pred.to_dict()
+
+
 def reaction_equation_compound_mapping_likelihood(r1, r2, cpd_pred,
                                                   compartment_map={}):
+    cpd_pred = _cpd_pred_dict(cpd_pred)
     if r1.equation is None or r2.equation is None:
         # p value of observing undefined equation
         # it is independent of the condition of match or not
@@ -473,25 +515,29 @@ def get_best_p_value_set(r1, r2, cpd_pred, compartment_map):
         cpd_set1_left, cpd_set2_right, cpd_pred,
         cpd_set1_right, cpd_set2_left, compartment_map)
 
-    # maintain the direction with better p values
-    if (p_forward_match / p_forward_no_match
-            >= p_reverse_match / p_reverse_no_match):
+    # maintain the direction with the better log-likelihood ratio; the
+    # merged values are log-likelihoods, so the ratio comparison is a
+    # plain subtraction that cannot divide by zero when a p_no_match
+    # underflows
+    if (p_forward_match - p_forward_no_match
+            >= p_reverse_match - p_reverse_no_match):
         p_match = p_forward_match
         p_no_match = p_forward_no_match
     else:
         p_match = p_reverse_match
         p_no_match = p_reverse_no_match
 
-    return p_match, p_no_match
+    return math.exp(p_match), math.exp(p_no_match)
 
 
 def merge_partial_p_set(cpd_set1_left, cpd_set2_left, cpd_pred,
                         cpd_set1_right, cpd_set2_right, compartment_map):
-    """Merge the left hand side and right hand side p values together.
+    """Merge the left hand side and right hand side log p values together.
 
     The compound mapping is done separately on left hand side and
     right hand side.
-    Then the corresponding p_match and p_no_match are merged together.
+    Then the corresponding log p_match and log p_no_match are summed,
+    staying in log-space to avoid underflow.
     """
     p_set_left = \
         reaction_equation_mapping_approx_max_likelihood(
@@ -499,24 +545,51 @@ def merge_partial_p_set(cpd_set1_left, cpd_set2_left, cpd_pred,
     p_set_right = \
         reaction_equation_mapping_approx_max_likelihood(
             cpd_set1_right, cpd_set2_right, cpd_pred, compartment_map)
-    p_match = p_set_left[0] * p_set_right[0]
-    p_no_match = p_set_left[1] * p_set_right[1]
+    p_match = p_set_left[0] + p_set_right[0]
+    p_no_match = p_set_left[1] + p_set_right[1]
     return p_match, p_no_match
 
 
+# Cache of compound sets per (equation, side). get_best_p_value_set asks
+# for the same four sets for every pairing of a reaction, so without the
+# cache each side is rebuilt once per reaction pair instead of once per
+# reaction. Equations hash by content, so the cache also hits in pool
+# workers operating on unpickled copies.
+_CPD_SET_CACHE = {}
+_CPD_SET_CACHE_SIZE = 8192
+
+
 def get_cpd_set(equation, left=True):
+    key = (equation, left)
+    cpd_set = _CPD_SET_CACHE.get(key)
+    if cpd_set is not None:
+        return cpd_set
+
     if left:  # value of left-side compound is negtive
         coef = 1
     else:  # value of right-side compound is positive
         coef = -1
     # pick compounds at one side only
-    cpd_set = set(
+    cpd_set = frozenset(
         compound
         for compound, value in equation.compounds
         if coef * value < 0)
+
+    if len(_CPD_SET_CACHE) >= _CPD_SET_CACHE_SIZE:
+        _CPD_SET_CACHE.clear()
+    _CPD_SET_CACHE[key] = cpd_set
     return cpd_set
 
 
+# Log-probabilities of observing a shared or a differing gene under the
+# match and no-match hypotheses, precomputed so the per-pair work is a
+# multiply-add instead of two pow() calls.
+_LOG_GENE_PRESENT_MATCH = math.log(0.99)
+_LOG_GENE_DIFFER_MATCH = math.log(0.01)
+_LOG_GENE_PRESENT_NO_MATCH = math.log(0.10)
+_LOG_GENE_DIFFER_NO_MATCH = math.log(0.90)
+
+
 def reaction_genes_likelihood(r1, r2):
     if r1.genes is None or r2.genes is None:
         # p value of observing undefined genes
@@ -524,195 +597,319 @@ def reaction_genes_likelihood(r1, r2):
         p_match = 1
         p_no_match = 1
     else:
-        # calculating p_match
         present = len(r1.genes & r2.genes)
         differ = len(r1.genes ^ r2.genes)
         # total = len(r1.genes | r2.genes)
 
-        p_present = 0.99
-        p_differ = 0.01
-        p_match = p_present**present * p_differ**differ
-
-        # calculating p_no_match
-        p_present = 0.10
-        p_differ = 0.90
-        p_no_match = p_present**present * p_differ**differ
+        # accumulate in the log-domain to delay underflow on large gene
+        # sets as long as possible
+        p_match = math.exp(
+            present * _LOG_GENE_PRESENT_MATCH +
+            differ * _LOG_GENE_DIFFER_MATCH)
+        p_no_match = math.exp(
+            present * _LOG_GENE_PRESENT_NO_MATCH +
+            differ * _LOG_GENE_DIFFER_NO_MATCH)
 
     return p_match, p_no_match
 
 
-def fake_likelihood(e1, e2):
-    """Generate fake likelihood if corresponding mapping is not required."""
-    return 1, 1
+# Per-process state for the pairwise_likelihood workers. The entry lists,
+# the likelihood callable and its invariant parameters are installed once
+# per worker by the pool initializer instead of being pickled into every
+# task.
+_pairwise_worker_state = None
+
+
+def _init_pairwise_worker(entries1, entries2, likelihood, params):
+    global _pairwise_worker_state
+    _pairwise_worker_state = (entries1, entries2, likelihood, params)
+
 
+def generate_likelihood(bounds):
+    """Compute likelihoods for a contiguous range of pair indices.
 
-def generate_likelihood(tasks):
-    pair, likelihood, params = tasks
-    e1, e2 = pair
-    p1, p2 = likelihood(e1, e2, *params)
-    return e1.id, e2.id, p1, p2
+    Pairs are numbered row-major over the (entries1, entries2) grid held
+    in the worker state, so a task is just the two range bounds.
+    """
+    entries1, entries2, likelihood, params = _pairwise_worker_state
+    n2 = len(entries2)
+    result = []
+    for k in range(*bounds):
+        p = likelihood(entries1[k // n2], entries2[k % n2], *params)
+        result.append(p)
+    return result
 
 
-def pairwise_likelihood(pool, chunksize, model1, model2, likelihood, params):
+def pairwise_likelihood(nproc, chunksize, model1, model2, likelihood, params):
     """Compute likelihood of all pairwise comparisons.
 
     Returns likelihoods as a dataframe with a column for each hypothesis.
+    A dedicated pool is spawned per pass with the entry lists and the
+    likelihood installed once per worker; tasks are integer index ranges
+    and results are streamed into preallocated arrays.
+    """
+    entries1 = list(itervalues(model1))
+    entries2 = list(itervalues(model2))
+    pairs = len(entries1) * len(entries2)
+    p_match = np.empty(pairs)
+    p_no_match = np.empty(pairs)
+    chunksize = max(1, chunksize)
+    bounds = ((start, min(start + chunksize, pairs))
+              for start in range(0, pairs, chunksize))
+    pool = Pool(nproc, initializer=_init_pairwise_worker,
+                initargs=(entries1, entries2, likelihood, params))
+    try:
+        i = 0
+        for chunk in pool.imap(generate_likelihood, bounds):
+            for p1, p2 in chunk:
+                p_match[i] = p1
+                p_no_match[i] = p2
+                i += 1
+    finally:
+        pool.close()
+        pool.join()
+    return _likelihood_frame(entries1, entries2, p_match, p_no_match)
+
+
+def _likelihood_frame(entries1, entries2, p_match, p_no_match):
+    """Wrap pairwise likelihood matrices in a dataframe.
+
+    The layout matches :func:`pairwise_likelihood`: one row per (e1, e2)
+    pair with a column for each hypothesis.
     """
-    tasks = (((e1, e2), likelihood, params)
-             for e1, e2 in product(itervalues(model1), itervalues(model2)))
-    result = pool.map(generate_likelihood, tasks, chunksize=chunksize)
-    return pd.DataFrame.from_records(result, index=('e1', 'e2'),
-                                     columns=('e1', 'e2', 'p1', 'p2'))
+    index = pd.MultiIndex.from_product(
+        [[e.id for e in entries1], [e.id for e in entries2]],
+        names=['e1', 'e2'])
+    return pd.DataFrame(
+        {'p1': p_match.ravel(), 'p2': p_no_match.ravel()}, index=index)
+
+
+# The attribute likelihood matrices hold a handful of branch constants in
+# [0, 1], so float32 is plenty; halving their footprint doubles cache
+# residency in the combine and posterior passes. Quantities that can
+# underflow (equation/gene likelihoods, products, logs) stay float64.
+_LIKELIHOOD_DTYPE = np.float32
+
+
+def _equality_likelihoods(equal, defined, p_match_equal, p_match_not_equal,
+                          prior, marg_equal, marg_not_equal):
+    """Vectorized counterpart of the equality-based likelihood functions.
+
+    ``equal`` is the boolean matrix marking the pairs where the attribute
+    is considered equal; ``defined`` marks the pairs where the attribute is
+    present on both sides. Pairs with an undefined attribute observe
+    likelihood 1 under both hypotheses, like the scalar functions.
+    """
+    p_no_match_equal = max(
+        0, (marg_equal - p_match_equal * prior) / (1.0 - prior))
+    p_no_match_not_equal = max(
+        0, (marg_not_equal - p_match_not_equal * prior) / (1.0 - prior))
+
+    p_match = np.where(
+        equal, _LIKELIHOOD_DTYPE(p_match_equal),
+        _LIKELIHOOD_DTYPE(p_match_not_equal))
+    p_no_match = np.where(
+        equal, _LIKELIHOOD_DTYPE(p_no_match_equal),
+        _LIKELIHOOD_DTYPE(p_no_match_not_equal))
+    if defined is not None:
+        p_match[~defined] = 1.0
+        p_no_match[~defined] = 1.0
+    return p_match, p_no_match
+
+
+def _equality_codes(values1, values2):
+    """Factorize two value arrays into integer codes for comparison.
+
+    Values that compare equal get the same code, so equality over the
+    broadcast pair grid becomes a cheap integer compare instead of
+    elementwise Python object comparison. Missing values (None) get the
+    categorical code -1 and must be masked by the caller's defined mask.
+    """
+    codes = pd.Categorical(np.concatenate([values1, values2])).codes
+    return codes[:len(values1)], codes[len(values1):]
+
+
+_CompoundArrays = namedtuple(
+    '_CompoundArrays',
+    ['entries', 'ids', 'names', 'name_defined', 'charges', 'charge_defined',
+     'formula_original', 'formula_neutral', 'formula_defined', 'keggs',
+     'kegg_defined'])
+
+
+def _extract_compound_arrays(compounds):
+    """Extract per-attribute arrays from a model's compound entries.
+
+    Converting the entries to a struct-of-arrays layout once per model
+    means the broadcasting passes in :func:`map_model_compounds` operate
+    on plain NumPy arrays instead of repeating per-pair attribute lookups.
+    """
+    entries = list(itervalues(compounds))
+    formula_keys = [
+        util.formula_keys(c.formula, c.charge) for c in entries]
+    return _CompoundArrays(
+        entries=entries,
+        ids=np.array([c.id.lower() for c in entries], dtype=object),
+        names=np.array(
+            [util.name_normal(c.name) for c in entries], dtype=object),
+        name_defined=np.array([c.name is not None for c in entries]),
+        charges=np.array([c.charge for c in entries], dtype=object),
+        charge_defined=np.array([c.charge is not None for c in entries]),
+        formula_original=np.array(
+            [k for k, _ in formula_keys], dtype=object),
+        formula_neutral=np.array([k for _, k in formula_keys], dtype=object),
+        formula_defined=np.array([c.formula is not None for c in entries]),
+        keggs=np.array([c.kegg for c in entries], dtype=object),
+        kegg_defined=np.array([c.kegg is not None for c in entries]))
 
 
 def likelihood_products(likelihood_dfs):
-    """Combine likelihood dataframes."""
-    return reduce(operator.mul, likelihood_dfs, 1.0)
+    """Combine likelihood dataframes.
 
+    The products are accumulated in place on a single array instead of
+    allocating an intermediate dataframe per multiplication.
+    """
+    dfs = list(likelihood_dfs)
+    if not dfs:
+        return 1.0
+    # accumulate in float64; the combined products can be far smaller
+    # than the individual likelihoods
+    values = dfs[0].to_numpy(dtype=np.float64, copy=True)
+    for df in dfs[1:]:
+        np.multiply(values, df.to_numpy(), out=values)
+    return pd.DataFrame(values, index=dfs[0].index, columns=dfs[0].columns)
 
-def bayes_posterior(prior, likelihood_df):
-    """Calculate posterior given likelihoods and prior."""
-    p_1 = prior * likelihood_df.iloc[:, 0]
-    p_2 = (1.0 - prior) * likelihood_df.iloc[:, 1]
-    return p_1 / (p_1 + p_2)
 
+def bayes_posterior(prior, likelihood_df):
+    """Calculate posterior given likelihoods and prior.
 
-def parallel_equel(tasks):
-    func, params = tasks
-    return func(*params)
+    The posterior is evaluated as the logistic function of the log odds,
+    which stays stable when both likelihood products are very small.
+    """
+    with np.errstate(divide='ignore'):
+        log_odds = (math.log(prior / (1.0 - prior)) +
+                    np.log(likelihood_df.iloc[:, 0].astype(np.float64)) -
+                    np.log(likelihood_df.iloc[:, 1].astype(np.float64)))
+    return expit(log_odds)
 
 
 def map_model_compounds(model1, model2, nproc=1, outpath='.',
                         log=False, kegg=False):
     """Map compounds of two models."""
-    compound_pairs = len(model1.compounds) * len(model2.compounds)
+    arrays1 = _extract_compound_arrays(model1.compounds)
+    arrays2 = _extract_compound_arrays(model2.compounds)
+    compounds1 = arrays1.entries
+    compounds2 = arrays2.entries
+    compound_pairs = len(compounds1) * len(compounds2)
 
     # Compound prior
     # For the prior, use a guesstimate that 95% of the
     # smaller model can be mapped.
-    compound_prior = (0.95 * min(len(model1.compounds),
-                                 len(model2.compounds))) / compound_pairs
+    compound_prior = (0.95 * min(len(compounds1),
+                                 len(compounds2))) / compound_pairs
 
-    # Initialize parallel pool of workers
-    chunksize = compound_pairs // nproc
-    pool = Pool(nproc)
     # Compound ID
+    id_codes1, id_codes2 = _equality_codes(arrays1.ids, arrays2.ids)
+    id_equal = id_codes1[:, None] == id_codes2[None, :]
+
     # Marginal probability of observing two equal compound IDs
-    tasks = ((util.id_equals, (c1.id, c2.id)) for c1, c2 in product(
-        itervalues(model1.compounds), itervalues(model2.compounds)))
-    result = pool.map(parallel_equel, tasks, chunksize=chunksize)
-    compound_id_marg = sum(result) / float(compound_pairs)
+    compound_id_marg = id_equal.mean()
 
     print('Calculating compound ID likelihoods...')
     sys.stdout.flush()
-    compound_id_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.compounds, model2.compounds,
-        compound_id_likelihood, (compound_prior, compound_id_marg))
+    compound_id_likelihoods = _likelihood_frame(
+        compounds1, compounds2, *_equality_likelihoods(
+            id_equal, None, 0.65, 0.35, compound_prior,
+            compound_id_marg, 1.0 - compound_id_marg))
 
     # Compound name
+    name_defined = (
+        arrays1.name_defined[:, None] & arrays2.name_defined[None, :])
+    name_codes1, name_codes2 = _equality_codes(arrays1.names, arrays2.names)
+    name_equal = name_defined & (name_codes1[:, None] == name_codes2[None, :])
+
     # Marginal probability of observing two similar names
-    tasks = ((util.name_equals, (c1.name, c2.name)) for c1, c2 in product(
-        itervalues(model1.compounds), itervalues(model2.compounds)))
-    result = pool.map(parallel_equel, tasks, chunksize=chunksize)
-    compound_name_marg = sum(result) / float(compound_pairs)
+    compound_name_marg = name_equal.mean()
 
     print('Calculating compound name likelihoods...')
     sys.stdout.flush()
-    compound_name_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.compounds, model2.compounds,
-        compound_name_likelihood, (compound_prior, compound_name_marg))
+    compound_name_likelihoods = _likelihood_frame(
+        compounds1, compounds2, *_equality_likelihoods(
+            name_equal, None, 0.60, 0.40, compound_prior,
+            compound_name_marg, 1.0 - compound_name_marg))
 
     # Compound charge
+    charge_defined = (
+        arrays1.charge_defined[:, None] & arrays2.charge_defined[None, :])
+    charge_equal = charge_defined & (
+        arrays1.charges[:, None] == arrays2.charges[None, :])
+
     # Marginal probability of observing two compounds with the same charge
-    compound_charge_equal_marg = sum(
-        c1.charge is not None and
-        c2.charge is not None and
-        c1.charge == c2.charge
-        for c1, c2 in product(
-            itervalues(model1.compounds), itervalues(model2.compounds))
-    ) / compound_pairs
+    compound_charge_equal_marg = charge_equal.mean()
 
     # Marginal probability of observing two compounds with different charge
-    compound_charge_not_equal_marg = sum(
-        c1.charge is not None and
-        c2.charge is not None and
-        c1.charge != c2.charge
-        for c1, c2 in product(
-            itervalues(model1.compounds), itervalues(model2.compounds))
-    ) / compound_pairs
+    compound_charge_not_equal_marg = (charge_defined & ~charge_equal).mean()
 
     print('Calculating compound charge likelihoods...')
     sys.stdout.flush()
 
-    compound_charge_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.compounds, model2.compounds,
-        compound_charge_likelihood, (
-            compound_prior,
-            compound_charge_equal_marg,
-            compound_charge_not_equal_marg))
+    compound_charge_likelihoods = _likelihood_frame(
+        compounds1, compounds2, *_equality_likelihoods(
+            charge_equal, charge_defined, 0.9, 0.1, compound_prior,
+            compound_charge_equal_marg, compound_charge_not_equal_marg))
 
     # Compound formula
+    formula_defined = (
+        arrays1.formula_defined[:, None] & arrays2.formula_defined[None, :])
+    original_codes1, original_codes2 = _equality_codes(
+        arrays1.formula_original, arrays2.formula_original)
+    neutral_codes1, neutral_codes2 = _equality_codes(
+        arrays1.formula_neutral, arrays2.formula_neutral)
+    formula_equal = formula_defined & (
+        (original_codes1[:, None] == original_codes2[None, :]) |
+        (neutral_codes1[:, None] == neutral_codes2[None, :]))
+
     # Marginal probability of observing two compounds with the same formula
-    tasks = ((
-        util.formula_equals,
-        (c1.formula, c2.formula, c1.charge, c2.charge))
-        for c1, c2 in product(
-            itervalues(model1.compounds), itervalues(model2.compounds)))
-    result = pool.map(parallel_equel, tasks, chunksize=chunksize)
-    compound_formula_equal_marg = sum(result) / float(compound_pairs)
+    compound_formula_equal_marg = formula_equal.mean()
 
     # Marginal probability of observing two compounds with different formula
-    compound_formula_not_equal_marg = 1.0 - compound_formula_equal_marg - (
-        sum(c1.formula is None or c2.formula is None
-            for c1, c2 in product(itervalues(model1.compounds),
-                                  itervalues(model2.compounds))) /
-        compound_pairs)
+    compound_formula_not_equal_marg = (
+        formula_defined & ~formula_equal).mean()
 
     print('Calculating compound formula likelihoods...')
     sys.stdout.flush()
-    compound_formula_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.compounds, model2.compounds,
-        compound_formula_likelihood, (
-            compound_prior, compound_formula_equal_marg,
-            compound_formula_not_equal_marg))
+    compound_formula_likelihoods = _likelihood_frame(
+        compounds1, compounds2, *_equality_likelihoods(
+            formula_equal, formula_defined, 0.9, 0.1, compound_prior,
+            compound_formula_equal_marg, compound_formula_not_equal_marg))
 
     # Compound KEGG id
     if kegg:  # run KEGG id mapping
+        kegg_defined = (
+            arrays1.kegg_defined[:, None] & arrays2.kegg_defined[None, :])
+        kegg_codes1, kegg_codes2 = _equality_codes(
+            arrays1.keggs, arrays2.keggs)
+        kegg_equal = kegg_defined & (
+            kegg_codes1[:, None] == kegg_codes2[None, :])
+
         # Marginal probability of observing two compounds
         # where KEGG ids are equal
-        compound_kegg_equal_marg = sum(
-            c1.kegg is not None and
-            c2.kegg is not None and
-            c1.kegg == c2.kegg
-            for c1, c2 in product(
-                itervalues(model1.compounds),
-                itervalues(model2.compounds))
-        ) / compound_pairs
+        compound_kegg_equal_marg = kegg_equal.mean()
 
         # Marginal probability of observing two compounds
         # where KEGG ids are different
-        compound_kegg_not_equal_marg = sum(
-            c1.kegg is not None and
-            c2.kegg is not None and
-            c1.kegg != c2.kegg for c1, c2 in product(
-                itervalues(model1.compounds),
-                itervalues(model2.compounds))
-        ) / compound_pairs
+        compound_kegg_not_equal_marg = (kegg_defined & ~kegg_equal).mean()
 
         print('Calculating compound KEGG ID likelihoods...')
         sys.stdout.flush()
-        compound_kegg_likelihoods = pairwise_likelihood(
-            pool, chunksize, model1.compounds, model2.compounds,
-            compound_kegg_likelihood, (
-                compound_prior, compound_kegg_equal_marg,
-                compound_kegg_not_equal_marg))
+        compound_kegg_likelihoods = _likelihood_frame(
+            compounds1, compounds2, *_equality_likelihoods(
+                kegg_equal, kegg_defined, 0.65, 0.35, compound_prior,
+                compound_kegg_equal_marg, compound_kegg_not_equal_marg))
     else:  # run fake mapping
-        compound_kegg_likelihoods = pairwise_likelihood(
-            pool, chunksize, model1.compounds, model2.compounds,
-            fake_likelihood, ())
-
-    pool.close()
-    pool.join()
+        ones = np.ones(
+            (len(compounds1), len(compounds2)), dtype=_LIKELIHOOD_DTYPE)
+        compound_kegg_likelihoods = _likelihood_frame(
+            compounds1, compounds2, ones, ones)
 
     if log:
         merge_result = pd.merge(compound_id_likelihoods,
@@ -750,57 +947,68 @@ def map_model_reactions(model1, model2, cpd_pred, nproc=1, outpath='.',
                         log=False, gene=False, compartment_map={}):
     """Map reactions of two models."""
     # Mapping of reactions
-    reaction_pairs = len(model1.reactions) * len(model2.reactions)
+    reactions1 = list(itervalues(model1.reactions))
+    reactions2 = list(itervalues(model2.reactions))
+    reaction_pairs = len(reactions1) * len(reactions2)
 
     # Reaction prior
     # For the prior, use a guesstimate that 95%
     # of the smaller model can be mapped.
-    reaction_prior = (0.95 * min(len(model1.reactions),
-                                 len(model2.reactions))) / reaction_pairs
+    reaction_prior = (0.95 * min(len(reactions1),
+                                 len(reactions2))) / reaction_pairs
 
-    # Initialize parallel pool of workers
+    # Chunk size for the pool-based likelihood passes
     chunksize = reaction_pairs // nproc
-    pool = Pool(nproc)
 
     # Reaction ID
+    id_codes1, id_codes2 = _equality_codes(
+        np.array([r.id.lower() for r in reactions1], dtype=object),
+        np.array([r.id.lower() for r in reactions2], dtype=object))
+    id_equal = id_codes1[:, None] == id_codes2[None, :]
+
     # Marginal probability of observing two reactions with the same ids.
-    tasks = ((util.id_equals, (r1.id, r2.id)) for r1, r2 in product(
-        itervalues(model1.reactions),
-        itervalues(model2.reactions)))
-    result = pool.map(parallel_equel, tasks, chunksize=chunksize)
-    reaction_id_equal_marg = sum(result) / float(reaction_pairs)
+    reaction_id_equal_marg = id_equal.mean()
 
     # Marginal probability of observing two reactions with different ids.
     reaction_id_not_equal_marg = 1.0 - reaction_id_equal_marg
 
     print('Calculating reaction ID likelihoods...')
     sys.stdout.flush()
-    reaction_id_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.reactions, model2.reactions,
-        reaction_id_likelihood, (
-            reaction_prior,
+    reaction_id_likelihoods = _likelihood_frame(
+        reactions1, reactions2, *_equality_likelihoods(
+            id_equal, None, 0.52, 0.48, reaction_prior,
             reaction_id_equal_marg, reaction_id_not_equal_marg))
 
     # Reaction name
+    names1 = np.array(
+        [util.name_normal(r.name) for r in reactions1], dtype=object)
+    names2 = np.array(
+        [util.name_normal(r.name) for r in reactions2], dtype=object)
+    name_defined = (
+        np.array([n is not None for n in names1])[:, None] &
+        np.array([n is not None for n in names2])[None, :])
+    name_codes1, name_codes2 = _equality_codes(names1, names2)
+    name_equal = name_defined & (name_codes1[:, None] == name_codes2[None, :])
+
     # Marginal probability of observing two reactions with the same name.
-    tasks = ((util.name_equals, (r1.name, r2.name)) for r1, r2 in product(
-        itervalues(model1.reactions),
-        itervalues(model2.reactions)))
-    result = pool.map(parallel_equel, tasks, chunksize=chunksize)
-    reaction_name_equal_marg = sum(result) / float(reaction_pairs)
+    reaction_name_equal_marg = name_equal.mean()
 
     print('Calculating reaction name likelihoods...')
     sys.stdout.flush()
-    reaction_name_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.reactions, model2.reactions,
-        reaction_name_likelihood, (reaction_prior, reaction_name_equal_marg))
+    reaction_name_likelihoods = _likelihood_frame(
+        reactions1, reactions2, *_equality_likelihoods(
+            name_equal, None, 0.59, 0.41, reaction_prior,
+            reaction_name_equal_marg, 1.0 - reaction_name_equal_marg))
 
     # Reaction equation
+    # Convert the mapping scores up front; the likelihood would otherwise
+    # convert per pair.
+    cpd_pred = _cpd_pred_dict(cpd_pred)
 
     print('Calculating reaction equation likelihoods...')
     sys.stdout.flush()
     reaction_equation_likelihoods = pairwise_likelihood(
-        pool, chunksize, model1.reactions, model2.reactions,
+        nproc, chunksize, model1.reactions, model2.reactions,
         reaction_equation_compound_mapping_likelihood,
         (cpd_pred, compartment_map))
 
@@ -813,15 +1021,13 @@ def map_model_reactions(model1, model2, cpd_pred, nproc=1, outpath='.',
         print('Calculating reaction genes likelihoods...')
         sys.stdout.flush()
         reaction_genes_likelihoods = pairwise_likelihood(
-            pool, chunksize, model1.reactions, model2.reactions,
+            nproc, chunksize, model1.reactions, model2.reactions,
             reaction_genes_likelihood, ())
-    else:
-        reaction_genes_likelihoods = pairwise_likelihood(
-            pool, chunksize, model1.reactions, model2.reactions,
-            fake_likelihood, ())
-
-    pool.close()
-    pool.join()
+    else:  # run fake mapping
+        ones = np.ones(
+            (len(reactions1), len(reactions2)), dtype=_LIKELIHOOD_DTYPE)
+        reaction_genes_likelihoods = _likelihood_frame(
+            reactions1, reactions2, ones, ones)
 
     if log:
         merge_result = pd.merge(reaction_id_likelihoods,
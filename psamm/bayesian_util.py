@@ -27,61 +27,80 @@ from itertools import product
 from psamm.formula import Atom
 
 
+# Precompiled patterns for the name normalizations below; these run once
+# per entry when models are mapped, but also once per call from scripted
+# comparisons, so the compiled-pattern cache lookup is worth skipping.
+_SPECIAL_CHARS = re.compile(r'[^a-zA-Z0-9]')
+_COENZYME_A = re.compile(r'coenzymea')
+_NAME_PUNCTUATION = re.compile(r'[()\[\]_, -]')
+
+
 def id_equals(id1, id2):
     """Return True if the two IDs are considered equal."""
     return id1.lower() == id2.lower()
 
 
+def name_normal(name):
+    """Return the normalized form of a name compared by :func:`name_equals`.
+
+    Returns None if the name is undefined.
+    """
+    if name is None:
+        return None
+    # remove special chars, translate to lower case
+    name = _SPECIAL_CHARS.sub('', name.lower())
+    # unify Coenzyme A and CoA
+    return _COENZYME_A.sub('coa', name)
+
+
 def name_equals(name1, name2):
     """Return True if the two names are considered equal."""
     if name1 is None or name2 is None:
         return False
-    # remove special chars, translate to lower case
-    pattern = r'[^a-zA-Z0-9]'
-    name1 = re.sub(pattern, '', name1.lower())
-    name2 = re.sub(pattern, '', name2.lower())
-    # unify Coenzyme A and CoA
-    pattern = r'coenzymea'
-    name1 = re.sub(pattern, 'coa', name1.lower())
-    name2 = re.sub(pattern, 'coa', name2.lower())
-    return (name1 == name2)
+    return name_normal(name1) == name_normal(name2)
 
 
 def name_similar(name1, name2):
     """Return the possibility that two names are considered equal."""
-    pattern = r'[()\[\]_, -]'
     if name1 is None or name2 is None:
         return 0.01
-    name1 = re.sub(pattern, '', name1)
-    name2 = re.sub(pattern, '', name2)
+    name1 = _NAME_PUNCTUATION.sub('', name1)
+    name2 = _NAME_PUNCTUATION.sub('', name2)
     return max(0.01,
                (1 - float(levenshtein(name1, name2))
                 / max(len(name1), len(name2))))
 
 
+def formula_keys(formula, charge):
+    """Return hashable keys for the original and the neutral formula.
+
+    Two formulas are considered equal by :func:`formula_equals` if either
+    their original or their neutral keys compare equal. The keys are
+    hashable, so callers can normalize each formula once and compare (or
+    cache) the keys instead of re-deriving both variants per comparison.
+    """
+    if formula is None:
+        return None, None
+    original = []
+    neutral = []
+    for e, value in iteritems(formula):
+        original.append((e, value))
+        if e == Atom('H') and charge is not None:
+            value = value - charge  # No. of H in neutral state
+        neutral.append((e, value))
+    return frozenset(original), frozenset(neutral)
+
+
 def formula_equals(f1, f2, charge1, charge2):
     """Return True if the two formulas are considered equal."""
     if f1 is None or f2 is None:
         return False
 
-    def calc_formula(f, charge, neutral=False):
-        formula = {}
-        for e, value in iteritems(f):
-            if e != Atom('H') or charge is None or not neutral:
-                formula[e] = value
-            else:
-                formula[e] = value - charge  # No. of H in neutral stat
-        return formula
-
     # in case some model doesn't provide charge for non-neutral formula
-    # compare original formula
-    formula1 = calc_formula(f1, charge1)
-    formula2 = calc_formula(f2, charge2)
-    # compare neutral formula
-    formula1_neutral = calc_formula(f1, charge1, neutral=True)
-    formula2_neutral = calc_formula(f2, charge2, neutral=True)
-
-    return (formula1 == formula2) or (formula1_neutral == formula2_neutral)
+    # compare the original formula as well as the neutral formula
+    original1, neutral1 = formula_keys(f1, charge1)
+    original2, neutral2 = formula_keys(f2, charge2)
+    return (original1 == original2) or (neutral1 == neutral2)
 
 
 def formula_exact(f1, f2):
@@ -20,7 +20,7 @@ from __future__ import unicode_literals
 
 import logging
 
-from six import text_type, itervalues, string_types
+from six import text_type, iteritems, itervalues, string_types
 from collections import defaultdict
 
 from ..command import Command
@@ -34,6 +34,13 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _text(value):
+    """Return value as text, avoiding conversion of already-text values."""
+    if isinstance(value, text_type):
+        return value
+    return text_type(value)
+
+
 class ExcelExportCommand(Command):
     """Export the metabolic model as an Excel workbook."""
 
@@ -50,121 +57,138 @@ class ExcelExportCommand(Command):
                 'Excel export requires the XlsxWriter python module'
                 ' ("pip install xlsxwriter")')
 
-        workbook = xlsxwriter.Workbook(self._args.file)
-
-        model_info = workbook.add_worksheet(name='Model Info')
-
-        model_info.write(0, 0, ('Model Name: {}'.format(model.name)))
-        model_info.write(
-            1, 0, ('Biomass Reaction: {}'.format(model.biomass_reaction)))
-        model_info.write(
-            2, 0, ('Default Flux Limits: {}'.format(model.default_flux_limit)))
-        if model.version_string is not None:
+        # Write the workbook through a large buffered stream so the final
+        # zip assembly issues few large writes instead of many small ones.
+        output = open(self._args.file, 'wb', buffering=1 << 20)
+        try:
+            # Flush each finished row to disk instead of keeping the whole
+            # sheet in memory; peak memory then stays bounded by a single row.
+            # Disable the per-cell heuristics that test every string against
+            # number/formula/URL patterns; exported values are plain text.
+            workbook = xlsxwriter.Workbook(output, {
+                'constant_memory': True,
+                'strings_to_numbers': False,
+                'strings_to_formulas': False,
+                'strings_to_urls': False,
+            })
+
+            model_info = workbook.add_worksheet(name='Model Info')
+
+            model_info.write(0, 0, ('Model Name: {}'.format(model.name)))
+            model_info.write(
+                1, 0, ('Biomass Reaction: {}'.format(model.biomass_reaction)))
             model_info.write(
-                3, 0, ('Version: {}'.format(model.version_string)))
-
-        reaction_sheet = workbook.add_worksheet(name='Reactions')
-
-        property_set = set()
-        for reaction in model.reactions:
-            property_set.update(reaction.properties)
-        property_list = list(property_set)
-        property_list_sorted = sorted(property_list,
-                                      key=lambda x: (x != 'id',
-                                                     x != 'equation', x))
-        model_reactions = set(model.model)
-        for z, i in enumerate(property_list_sorted + ['in_model']):
-            reaction_sheet.write_string(0, z, text_type(i))
-        gene_rxn = defaultdict(list)
-        for x, i in enumerate(model.reactions):
-            for y, j in enumerate(property_list_sorted):
-                value = i.properties.get(j)
-                if value is not None:
-                    reaction_sheet.write_string(x+1, y, text_type(value))
-            reaction_sheet.write_string(
-                x+1, len(property_list_sorted),
-                text_type(i.id in model_reactions))
-            assoc = None
-            if i.genes is None:
-                continue
-            elif isinstance(i.genes, string_types):
-                assoc = boolean.Expression(i.genes)
-                for j in assoc.variables:
-                    gene_rxn[str(j)].append(i.id)
-            else:
-                variables = [boolean.Variable(g) for g in i.genes]
-                assoc = boolean.Expression(boolean.And(*variables))
-                for j in assoc.variables:
-                    gene_rxn[str(j)].append(i.id)
-
-        compound_sheet = workbook.add_worksheet(name='Compounds')
-
-        compound_set = set()
-        for compound in model.compounds:
-            compound_set.update(compound.properties)
-
-        compound_list_sorted = sorted(compound_set,
-                                      key=lambda x: (x != 'id',
-                                                     x != 'name', x))
-
-        metabolic_model = self._model.create_metabolic_model()
-        model_compounds = set(x.name for x in metabolic_model.compounds)
-        for z, i in enumerate(compound_list_sorted + ['in_model']):
-            compound_sheet.write_string(0, z, text_type(i))
-        for x, i in enumerate(model.compounds):
-            for y, j in enumerate(compound_list_sorted):
-                value = i.properties.get(j)
-                if value is not None:
-                    compound_sheet.write_string(x+1, y, text_type(value))
-            compound_sheet.write_string(
-                x+1, len(compound_list_sorted),
-                text_type(i.id in model_compounds))
-
-        gene_sheet = workbook.add_worksheet(name='Genes')
-        gene_sheet.write_string(0, 0, 'Gene')
-        gene_sheet.write_string(0, 1, 'Reaction_List')
-        for x, i in enumerate(sorted(gene_rxn)):
-            gene_sheet.write_string(x+1, 0, i)
-            gene_sheet.write_string(x+1, 1, '#'.join(gene_rxn.get(i)))
-
-        exchange_sheet = workbook.add_worksheet(name='Exchange')
-
-        exchange_sheet.write_string(0, 0, 'Compound ID')
-        exchange_sheet.write_string(0, 1, 'Reaction ID')
-        exchange_sheet.write_string(0, 2, 'Lower Limit')
-        exchange_sheet.write_string(0, 3, 'Upper Limit')
-
-        default_flux = model.default_flux_limit
-
-        for x, (compound, reaction, lower, upper) in enumerate(
-                itervalues(model.exchange)):
-            if lower is None:
-                lower = -default_flux
-
-            if upper is None:
-                upper = default_flux
-
-            exchange_sheet.write(x+1, 0, text_type(compound))
-            exchange_sheet.write(x+1, 1, text_type(reaction))
-            exchange_sheet.write(x+1, 2, text_type(lower))
-            exchange_sheet.write(x+1, 3, text_type(upper))
-
-        limits_sheet = workbook.add_worksheet(name='Limits')
-
-        limits_sheet.write_string(0, 0, 'Reaction ID')
-        limits_sheet.write_string(0, 1, 'Lower Limit')
-        limits_sheet.write_string(0, 2, 'Upper Limit')
-
-        for x, limit in enumerate(itervalues(model.limits)):
-            reaction_id, lower, upper = limit
-            if lower is None:
-                lower = -default_flux
-
-            if upper is None:
-                upper = default_flux
-
-            limits_sheet.write(x+1, 0, reaction_id)
-            limits_sheet.write(x+1, 1, lower)
-            limits_sheet.write(x+1, 2, upper)
-
-        workbook.close()
+                2, 0, ('Default Flux Limits: {}'.format(
+                    model.default_flux_limit)))
+            if model.version_string is not None:
+                model_info.write(
+                    3, 0, ('Version: {}'.format(model.version_string)))
+
+            in_model_text = ('False', 'True')
+
+            reaction_sheet = workbook.add_worksheet(name='Reactions')
+
+            reactions = list(model.reactions)
+            property_set = set().union(
+                *(reaction.properties for reaction in reactions))
+            # Sort with 'id' and 'equation' first, without paying for a
+            # tuple-building key function on every comparison.
+            head = [j for j in ('id', 'equation') if j in property_set]
+            property_list_sorted = head + sorted(property_set.difference(head))
+            model_reactions = frozenset(model.model)
+            reaction_sheet.write_row(0, 0, property_list_sorted + ['in_model'])
+            # Scatter each entry's properties into the row by column index
+            # instead of probing the property dict once per column.
+            reaction_col = {j: y for y, j in enumerate(property_list_sorted)}
+            empty_reaction_row = [''] * len(property_list_sorted)
+            write_reaction_row = reaction_sheet.write_row
+            gene_rxn = defaultdict(list)
+            for x, i in enumerate(reactions):
+                row = list(empty_reaction_row)
+                if i.properties:
+                    for j, value in iteritems(i.properties):
+                        if value is not None:
+                            row[reaction_col[j]] = _text(value)
+                row.append(in_model_text[i.id in model_reactions])
+                write_reaction_row(x+1, 0, row)
+                assoc = None
+                if i.genes is None:
+                    continue
+                elif isinstance(i.genes, string_types):
+                    assoc = boolean.Expression(i.genes)
+                    for j in assoc.variables:
+                        gene_rxn[str(j)].append(i.id)
+                else:
+                    variables = [boolean.Variable(g) for g in i.genes]
+                    assoc = boolean.Expression(boolean.And(*variables))
+                    for j in assoc.variables:
+                        gene_rxn[str(j)].append(i.id)
+
+            compound_sheet = workbook.add_worksheet(name='Compounds')
+
+            compounds = list(model.compounds)
+            compound_set = set().union(
+                *(compound.properties for compound in compounds))
+
+            head = [j for j in ('id', 'name') if j in compound_set]
+            compound_list_sorted = head + sorted(compound_set.difference(head))
+
+            metabolic_model = self._model.create_metabolic_model()
+            model_compounds = frozenset(
+                x.name for x in metabolic_model.compounds)
+            compound_sheet.write_row(0, 0, compound_list_sorted + ['in_model'])
+            compound_col = {j: y for y, j in enumerate(compound_list_sorted)}
+            empty_compound_row = [''] * len(compound_list_sorted)
+            write_compound_row = compound_sheet.write_row
+            for x, i in enumerate(compounds):
+                row = list(empty_compound_row)
+                if i.properties:
+                    for j, value in iteritems(i.properties):
+                        if value is not None:
+                            row[compound_col[j]] = _text(value)
+                row.append(in_model_text[i.id in model_compounds])
+                write_compound_row(x+1, 0, row)
+
+            gene_sheet = workbook.add_worksheet(name='Genes')
+            gene_sheet.write_row(0, 0, ('Gene', 'Reaction_List'))
+            for x, (gene, rxns) in enumerate(sorted(iteritems(gene_rxn))):
+                gene_sheet.write_string(x+1, 0, gene)
+                gene_sheet.write_string(x+1, 1, '#'.join(rxns))
+
+            exchange_sheet = workbook.add_worksheet(name='Exchange')
+
+            exchange_sheet.write_row(0, 0, (
+                'Compound ID', 'Reaction ID', 'Lower Limit', 'Upper Limit'))
+
+            default_flux = model.default_flux_limit
+            neg_default_flux = -default_flux
+
+            for x, (compound, reaction, lower, upper) in enumerate(
+                    itervalues(model.exchange)):
+                if lower is None:
+                    lower = neg_default_flux
+
+                if upper is None:
+                    upper = default_flux
+
+                exchange_sheet.write_row(x+1, 0, (
+                    _text(compound), _text(reaction), lower, upper))
+
+            limits_sheet = workbook.add_worksheet(name='Limits')
+
+            limits_sheet.write_row(0, 0, (
+                'Reaction ID', 'Lower Limit', 'Upper Limit'))
+
+            for x, limit in enumerate(itervalues(model.limits)):
+                reaction_id, lower, upper = limit
+                if lower is None:
+                    lower = neg_default_flux
+
+                if upper is None:
+                    upper = default_flux
+
+                limits_sheet.write_row(x+1, 0, (reaction_id, lower, upper))
+
+            workbook.close()
+        finally:
+            output.close()
@@ -191,6 +191,22 @@ class DictDatabase(MetabolicDatabase):
     def is_reversible(self, reaction_id):
         return reaction_id in self._reversible
 
+    def copy(self):
+        """Return an independent copy of the database.
+
+        Reactions set on the copy (or on this database) after the copy is
+        made do not appear in the other instance.
+        """
+        database = self.__class__()
+        database._reactions = OrderedDict(
+            (reaction_id, OrderedDict(values))
+            for reaction_id, values in iteritems(self._reactions))
+        database._compound_reactions = defaultdict(set)
+        for compound, reactions in iteritems(self._compound_reactions):
+            database._compound_reactions[compound] = set(reactions)
+        database._reversible = set(self._reversible)
+        return database
+
     def get_reaction_values(self, reaction_id):
         if reaction_id not in self._reactions:
             raise ValueError('Unknown reaction: {}'.format(repr(reaction_id)))
@@ -39,23 +39,37 @@ class FilePathContext(object):
     that remembers where a file was loaded so that other files can be loaded
     relatively.
     """
+    __slots__ = ('_filepath', '_basepath')
+
+    def __new__(cls, arg):
+        # Fast path: a context is immutable, so reuse it unchanged instead
+        # of rebuilding one for every parse helper in an include chain.
+        if isinstance(arg, FilePathContext):
+            return arg
+        return super(FilePathContext, cls).__new__(cls)
+
+    def __reduce__(self):
+        # __new__ takes a required argument and the class uses __slots__,
+        # so pickle and copy must be told to recreate the instance from
+        # the file path.
+        return self.__class__, (self._filepath,)
 
     def __init__(self, arg):
         """Create new context from a path or existing context"""
 
+        if arg is self:
+            # Existing context returned unchanged by __new__.
+            return
+
         if arg is not None:
             if isinstance(arg, string_types):
                 self._filepath = arg
             else:
                 self._filepath = arg.filepath
-
-            if self._filepath is not None:
-                self._basepath = os.path.dirname(self._filepath)
-            else:
-                self._basepath = None
         else:
             self._filepath = None
-            self._basepath = None
+
+        self._basepath = None
 
     @property
     def filepath(self):
@@ -63,15 +77,18 @@ class FilePathContext(object):
 
     @property
     def basepath(self):
+        # Computed on first use; the common include path never reads it.
+        if self._basepath is None and self._filepath is not None:
+            self._basepath = os.path.dirname(self._filepath)
         return self._basepath
 
     def resolve(self, relpath):
-        if self._basepath is None:
+        if self._filepath is None:
             raise ContextError('Context is a null context')
-        return FilePathContext(os.path.join(self._basepath, relpath))
+        return FilePathContext(os.path.join(self.basepath, relpath))
 
     def open(self, mode='r'):
-        if self._basepath is None:
+        if self._filepath is None:
             raise ContextError('Context is a null context')
         return open(self.filepath, mode)
 
@@ -42,6 +42,8 @@ class ModelEntry(object):
     properties can be modified, or immutable, where the properties cannot be
     modified or where modifications are ignored. The ID is always immutable.
     """
+    __slots__ = ()
+
     @abc.abstractproperty
     def id(self):
         """Identifier of entry."""
@@ -75,6 +77,8 @@ class CompoundEntry(ModelEntry):
     Entry subclass for representing compounds. This standardizes the properties
     ``formula`` and ``charge``.
     """
+    __slots__ = ()
+
     @property
     def formula(self):
         """Chemical formula of compound."""
@@ -92,6 +96,8 @@ class ReactionEntry(ModelEntry):
     Entry subclass for representing compounds. This standardizes the properties
     ``equation`` and ``genes``.
     """
+    __slots__ = ()
+
     @property
     def equation(self):
         """Reaction equation."""
@@ -108,6 +114,7 @@ class CompartmentEntry(ModelEntry):
 
     Entry subclass for representing compartments.
     """
+    __slots__ = ()
 
 
 class _BaseDictEntry(ModelEntry):
@@ -117,6 +124,10 @@ class _BaseDictEntry(ModelEntry):
     value corresponding to the ``id`` key in the dictionary is used. If this is
     not defined, a :class:`ValueError` is raised.
     """
+    # Slots avoid a per-instance __dict__; models commonly hold thousands
+    # of entries.
+    __slots__ = ('_id', '_properties', '_filemark')
+
     def __init__(self, abstract_type, properties={}, filemark=None, id=None):
         if isinstance(properties, abstract_type):
             self._id = id
@@ -165,6 +176,8 @@ class DictCompoundEntry(CompoundEntry, _BaseDictEntry):
         properties: dict or :class:`CompoundEntry` to construct from.
         filemark: Where the entry was parsed from (optional)
     """
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(DictCompoundEntry, self).__init__(CompoundEntry, *args, **kwargs)
 
@@ -187,6 +200,8 @@ class DictReactionEntry(ReactionEntry, _BaseDictEntry):
         properties: dict or :class:`ReactionEntry` to construct from.
         filemark: Where the entry was parsed from (optional)
     """
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(DictReactionEntry, self).__init__(ReactionEntry, *args, **kwargs)
 
@@ -209,6 +224,8 @@ class DictCompartmentEntry(CompartmentEntry, _BaseDictEntry):
         properties: dict or :class:`CompartmentEntry` to construct from.
         filemark: Where the entry was parsed from (optional)
     """
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(DictCompartmentEntry, self).__init__(
             CompartmentEntry, *args, **kwargs)
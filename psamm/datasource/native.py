@@ -28,22 +28,27 @@ from __future__ import absolute_import, unicode_literals
 
 import os
 import logging
-import re
-import csv
 import math
+import re
 from collections import OrderedDict
 
 import yaml
-from six import string_types, text_type, iteritems, itervalues, PY3
+from six import string_types, text_type, iteritems, itervalues, PY3, StringIO
 from decimal import Decimal
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
 from ..reaction import Reaction, Compound, Direction
 from ..expression import boolean
 from ..formula import Formula
 from ..metabolicmodel import MetabolicModel
 from ..database import DictDatabase
-from .context import FilePathContext, FileMark
-from .entry import (DictCompoundEntry as CompoundEntry,
+from .context import ContextError, FilePathContext, FileMark
+from .entry import (ModelEntry,
+                    DictCompoundEntry as CompoundEntry,
                     DictReactionEntry as ReactionEntry,
                     DictCompartmentEntry as CompartmentEntry)
 from .reaction import ReactionParser
@@ -53,10 +58,16 @@ from .. import util
 # Module-level logging
 logger = logging.getLogger(__name__)
 
-_HAS_YAML_LIBRARY = None
+_YAML_LOADER = None
 
 _REACTION_PARSER = ReactionParser()
 
+# Matches the content of a single table line with comments and surrounding
+# whitespace stripped, so each line costs one string allocation instead of
+# the intermediate strings of partition() and strip().
+_TABLE_LINE_RE = re.compile(
+    r'^[ \t]*([^#\n]*?)[ \t\r]*(?:#[^\n]*)?$', re.MULTILINE)
+
 
 class ParseError(Exception):
     """Exception used to signal errors while parsing"""
@@ -74,27 +85,169 @@ def float_constructor(loader, node):
     return Decimal(s)
 
 
-def yaml_load(stream):
-    """Load YAML file using safe loader."""
+def _create_yaml_loader_class():
+    """Create the loader class used for loading model files.
+
+    The class is based on the libyaml-backed CSafeLoader when available and
+    has the float constructor registered so that registration does not have
+    to be repeated for every file that is loaded.
+    """
     # Surprisingly, the CSafeLoader does not seem to be used by default.
     # Check whether the CSafeLoader is available and provide a log message
     # if it is not available.
-    global _HAS_YAML_LIBRARY
+    has_yaml_library = hasattr(yaml, 'CSafeLoader')
+    if not has_yaml_library:
+        logger.warning('libyaml was not found! Please install libyaml to'
+                       ' speed up loading the model files.')
 
-    if _HAS_YAML_LIBRARY is None:
-        _HAS_YAML_LIBRARY = hasattr(yaml, 'CSafeLoader')
-        if not _HAS_YAML_LIBRARY:
-            logger.warning('libyaml was not found! Please install libyaml to'
-                           ' speed up loading the model files.')
+    base_loader = yaml.CSafeLoader if has_yaml_library else yaml.SafeLoader
 
-    if _HAS_YAML_LIBRARY:
-        loader = yaml.CSafeLoader(stream)
-    else:
-        loader = yaml.SafeLoader(stream)
-    loader.add_constructor('tag:yaml.org,2002:float', float_constructor)
+    class ModelLoader(base_loader):
+        pass
+
+    ModelLoader.add_constructor('tag:yaml.org,2002:float', float_constructor)
+    return ModelLoader
+
+
+def yaml_load(stream):
+    """Load YAML file using safe loader."""
+    global _YAML_LOADER
+
+    if _YAML_LOADER is None:
+        _YAML_LOADER = _create_yaml_loader_class()
+
+    # Read file objects into a single buffer first; feeding libyaml a whole
+    # string avoids read callbacks into Python for every parsed chunk.
+    if hasattr(stream, 'read'):
+        stream = stream.read()
+
+    loader = _YAML_LOADER(stream)
     return loader.get_data()
 
 
+_YAML_FILE_CACHE = {}
+
+_ENTRY_FILE_CACHE = {}
+
+
+def _file_signature(path):
+    """Return a signature that changes when the file at path changes."""
+    stat_result = os.stat(path)
+    return (getattr(stat_result, 'st_mtime_ns', stat_result.st_mtime),
+            stat_result.st_size)
+
+
+def _load_yaml_file(context):
+    """Load a YAML file, caching the parsed document by real path.
+
+    Included files are re-read every time the enclosing parse generator is
+    iterated, so the parsed document is cached to avoid repeating the I/O
+    and YAML work. The cache entry is invalidated when the file changes on
+    disk. The document is pure data (dicts, lists and scalars) and must not
+    be mutated by callers.
+    """
+    path = os.path.realpath(context.filepath)
+    signature = _file_signature(path)
+
+    cached = _YAML_FILE_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with context.open('r') as f:
+        document = yaml_load(f)
+
+    _YAML_FILE_CACHE[path] = signature, document
+    return document
+
+
+def _prefetch_include_files(context, definitions):
+    """Warm the YAML document cache for files included by definitions.
+
+    File contents are read concurrently on a small thread pool; the reads
+    release the GIL, so the latency of opening and reading the include
+    files overlaps across files. The documents are then parsed on the
+    calling thread into the regular cache. Unreadable files are skipped
+    here and surface their error in the sequential parse instead.
+    """
+    if ThreadPoolExecutor is None or not isinstance(definitions, list):
+        return
+
+    pending = []
+    for definition in definitions:
+        if not isinstance(definition, dict) or 'include' not in definition:
+            continue
+
+        try:
+            include_context = context.resolve(definition['include'])
+        except ContextError:
+            return
+
+        file_format = resolve_format(
+            definition.get('format'), include_context.filepath)
+        if file_format != 'yaml':
+            continue
+
+        path = os.path.realpath(include_context.filepath)
+        if path not in _YAML_FILE_CACHE:
+            pending.append((include_context, path))
+
+    if len(pending) < 2:
+        return
+
+    def read_file(item):
+        include_context, path = item
+        try:
+            signature = _file_signature(path)
+            with include_context.open('r') as f:
+                return path, signature, f.read()
+        except (IOError, OSError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for result in executor.map(read_file, pending):
+            if result is None:
+                continue
+            path, signature, data = result
+            _YAML_FILE_CACHE[path] = signature, yaml_load(data)
+
+
+def _copy_cached_entries(entries):
+    """Return per-call copies of a cached entry list.
+
+    Entry objects are mutable (callers write into ``entry.properties``, e.g.
+    when translating IDs), so the cached instances must never be handed out
+    directly; each caller gets fresh copies constructed from the cached
+    entries. Non-entry items (limit tuples, reaction IDs) are immutable and
+    are passed through as-is.
+    """
+    return [entry.__class__(entry) if isinstance(entry, ModelEntry)
+            else entry for entry in entries]
+
+
+def _cached_file_entries(key, context, parse_func):
+    """Materialize entries parsed from an included file, caching the list.
+
+    The key identifies the kind of entries and any parse parameters that
+    affect the result, and is combined with the real path of the file. On
+    the first call the parse_func generator is materialized into a list;
+    later calls for an unchanged file reuse the cached list, avoiding the
+    parse cost. Every call, including the first, returns copies of the
+    cached entry objects so that mutations through one model cannot leak
+    into the cache or into other models sharing the included file.
+    """
+    path = os.path.realpath(context.filepath)
+    signature = _file_signature(path)
+    cache_key = key + (path,)
+
+    cached = _ENTRY_FILE_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return _copy_cached_entries(cached[1])
+
+    entries = list(parse_func())
+    _ENTRY_FILE_CACHE[cache_key] = signature, entries
+    return _copy_cached_entries(entries)
+
+
 class _OrderedEntrySet(object):
     """Ordered set of entity entries.
 
@@ -297,6 +450,19 @@ class ModelReader(object):
                     self.default_compartment):
                 yield reaction
 
+    def parse_reaction_ids(self):
+        """Yield IDs of reactions defined in the model.
+
+        Unlike :meth:`parse_reactions`, this does not parse reaction
+        equations or build entries for included files, which makes it much
+        cheaper when only the IDs are needed.
+        """
+
+        if 'reactions' in self._model:
+            for reaction_id in parse_reaction_id_list(
+                    self._context, self._model['reactions']):
+                yield reaction_id
+
     def has_model_definition(self):
         """Return True when the list of model reactions is set in the model."""
         return 'model' in self._model
@@ -364,6 +530,19 @@ class ModelReader(object):
                     self._context, self._model['compounds']):
                 yield compound
 
+    def parse_compound_ids(self):
+        """Yield IDs of compounds defined in the model.
+
+        Unlike :meth:`parse_compounds`, this does not build a
+        :class:`CompoundEntry` for every definition, which is much cheaper
+        when only the IDs are needed.
+        """
+
+        if 'compounds' in self._model:
+            for compound_id in parse_compound_id_list(
+                    self._context, self._model['compounds']):
+                yield compound_id
+
     @property
     def context(self):
         return self._context
@@ -455,6 +634,7 @@ class NativeModel(object):
         self._exchange = OrderedDict()
         self._limits = OrderedDict()
         self._model = OrderedDict()
+        self._metabolic_model = None
 
     @property
     def name(self):
@@ -546,7 +726,19 @@ class NativeModel(object):
         return self._model
 
     def create_metabolic_model(self):
-        """Create a :class:`psamm.metabolicmodel.MetabolicModel`."""
+        """Create a :class:`psamm.metabolicmodel.MetabolicModel`.
+
+        The model is only built on the first call; later calls return a
+        :meth:`psamm.metabolicmodel.MetabolicModel.copy` of the cached
+        model with its own copy of the reaction database, so commands that
+        need several metabolic model instances (e.g. one to mutate for
+        gap-filling) do not rebuild the database from scratch while staying
+        fully isolated from each other. Note that changes made to the
+        native model after the first call are not reflected in the
+        returned model.
+        """
+        if self._metabolic_model is not None:
+            return self._metabolic_model.copy(copy_database=True)
 
         def _translate_compartments(reaction, compartment):
             """Translate compound with missing compartments.
@@ -610,9 +802,10 @@ class NativeModel(object):
         if len(self.model) > 0:
             model_definition = self.model
 
-        return MetabolicModel.load_model(
+        self._metabolic_model = MetabolicModel.load_model(
             database, model_definition, itervalues(self.exchange),
             itervalues(self.limits), v_max=self.default_flux_limit)
+        return self._metabolic_model.copy(copy_database=True)
 
     def __repr__(self):
         return str('<{} name={!r}>'.format(self.__class__.__name__, self.name))
@@ -665,6 +858,8 @@ def parse_compound_list(path, compounds):
 
     context = FilePathContext(path)
 
+    _prefetch_include_files(context, compounds)
+
     for compound_def in compounds:
         if 'include' in compound_def:
             file_format = compound_def.get('format')
@@ -684,16 +879,29 @@ def parse_compound_table_file(path, f):
 
     context = FilePathContext(path)
 
-    for i, row in enumerate(csv.DictReader(f, delimiter=str('\t'))):
-        if 'id' not in row or row['id'].strip() == '':
-            raise ParseError('Expected `id` column in table')
+    # Reading the header once and splitting each line manually avoids the
+    # per-row dict and column state of csv.DictReader.
+    header = None
+    for i, line in enumerate(f):
+        line = line.rstrip('\r\n')
+        if line == '':
+            continue
 
-        props = {key: value for key, value in iteritems(row) if value != ''}
+        fields = line.split('\t')
+        if header is None:
+            header = fields
+            continue
+
+        props = {key: value for key, value in zip(header, fields)
+                 if value != ''}
+
+        if props.get('id', '').strip() == '':
+            raise ParseError('Expected `id` column in table')
 
         if 'charge' in props:
             props['charge'] = int(props['charge'])
 
-        mark = FileMark(context, i + 2, None)
+        mark = FileMark(context, i + 1, None)
         yield CompoundEntry(props, mark)
 
 
@@ -710,9 +918,9 @@ def resolve_format(format, path):
     """Looks at a file's extension and format (if any) and returns format.
     """
     if format is None:
-        if (re.match(r'.+\.(yml|yaml)$', path)):
+        if path.endswith(('.yml', '.yaml')):
             return 'yaml'
-        elif (re.match(r'.+\.tsv$', path)):
+        elif path.endswith('.tsv'):
             return 'tsv'
     else:
         return format.lower()
@@ -726,14 +934,22 @@ def parse_compound_file(path, format):
 
     context = FilePathContext(path)
 
+    for compound in _cached_file_entries(
+            ('compound', format), context,
+            lambda: _parse_compound_file_entries(context, format)):
+        yield compound
+
+
+def _parse_compound_file_entries(context, format):
+    """Parse entries of a compound file (uncached)."""
+
     # YAML files do not need to explicitly specify format
     format = resolve_format(format, context.filepath)
     if format == 'yaml':
         logger.debug('Parsing compound file {} as YAML'.format(
             context.filepath))
-        with context.open('r') as f:
-            for compound in parse_compound_yaml_file(context, f):
-                yield compound
+        for compound in parse_compound_list(context, _load_yaml_file(context)):
+            yield compound
     elif format == 'modelseed':
         logger.debug('Parsing compound file {} as ModelSEED TSV'.format(
             context.filepath))
@@ -751,6 +967,77 @@ def parse_compound_file(path, format):
             context.filepath))
 
 
+# Cache of parsed equation strings; equation strings repeat across reaction
+# files (e.g. transport templates) and Reaction objects are never mutated
+# after parsing, so cached instances can be shared between entries.
+_EQUATION_STRING_CACHE = {}
+_EQUATION_STRING_CACHE_SIZE = 4096
+
+
+def parse_compound_id_list(path, compounds):
+    """Parse a structured list of compounds, yielding only compound IDs.
+
+    This skips construction of compound entries. Path can be given as a
+    string or a context.
+    """
+
+    context = FilePathContext(path)
+
+    _prefetch_include_files(context, compounds)
+
+    for compound_def in compounds:
+        if 'include' in compound_def:
+            file_format = compound_def.get('format')
+            include_context = context.resolve(compound_def['include'])
+            for compound_id in parse_compound_id_file(
+                    include_context, file_format):
+                yield compound_id
+        else:
+            compound_id = compound_def.get('id')
+            _check_id(compound_id, 'Compound')
+            yield compound_id
+
+
+def parse_compound_id_file(path, format):
+    """Yield compound IDs of a compound file without building entries.
+
+    Only the id column (TSV) or id key (YAML) is extracted from each
+    compound definition. Other formats fall back to full parsing. Path can
+    be given as a string or a context.
+    """
+
+    context = FilePathContext(path)
+
+    format = resolve_format(format, context.filepath)
+    if format == 'yaml':
+        for compound_id in parse_compound_id_list(
+                context, _load_yaml_file(context)):
+            yield compound_id
+    elif format == 'tsv':
+        with context.open('r') as f:
+            header = None
+            for line in f:
+                line = line.rstrip('\r\n')
+                if line == '':
+                    continue
+
+                fields = line.split('\t')
+                if header is None:
+                    header = fields
+                    if 'id' not in header:
+                        raise ParseError('Expected `id` column in table')
+                    id_index = header.index('id')
+                    continue
+
+                if id_index >= len(fields) or fields[id_index].strip() == '':
+                    raise ParseError('Expected `id` column in table')
+
+                yield fields[id_index]
+    else:
+        for compound in parse_compound_file(context, format):
+            yield compound.id
+
+
 def parse_reaction_equation_string(equation, default_compartment):
     """Parse a string representation of a reaction equation.
 
@@ -769,48 +1056,64 @@ def parse_reaction_equation_string(equation, default_compartment):
                  for c, v in reaction.right)
         return Reaction(reaction.direction, left, right)
 
-    eq = _REACTION_PARSER.parse(equation).normalized()
-    return _translate_compartments(eq, default_compartment)
+    key = equation, default_compartment
+    reaction = _EQUATION_STRING_CACHE.get(key)
+    if reaction is None:
+        eq = _REACTION_PARSER.parse(equation).normalized()
+        reaction = _translate_compartments(eq, default_compartment)
+        if len(_EQUATION_STRING_CACHE) >= _EQUATION_STRING_CACHE_SIZE:
+            _EQUATION_STRING_CACHE.clear()
+        _EQUATION_STRING_CACHE[key] = reaction
+    return reaction
 
 
-def parse_reaction_equation(equation_def, default_compartment):
-    """Parse a structured reaction equation as obtained from a YAML file
+def _parse_reaction_compound_list(compound_defs, compartment):
+    """Parse a list of reactants or metabolites of a reaction equation.
 
-    Returns a Reaction.
+    Returns a list of compound, value pairs.
     """
+    compounds = []
+    for compound_def in compound_defs:
+        compound_id = compound_def.get('id')
+        _check_id(compound_id, 'Compound')
 
-    def parse_compound_list(l, compartment):
-        """Parse a list of reactants or metabolites"""
-        for compound_def in l:
-            compound_id = compound_def.get('id')
-            _check_id(compound_id, 'Compound')
+        value = compound_def.get('value')
+        if value is None:
+            raise ParseError('Missing value for compound {}'.format(
+                compound_id))
+
+        compound_compartment = compound_def.get('compartment')
+        if compound_compartment is None:
+            compound_compartment = compartment
 
-            value = compound_def.get('value')
-            if value is None:
-                raise ParseError('Missing value for compound {}'.format(
-                    compound_id))
+        compound = Compound(compound_id, compartment=compound_compartment)
+        compounds.append((compound, value))
 
-            compound_compartment = compound_def.get('compartment')
-            if compound_compartment is None:
-                compound_compartment = compartment
+    return compounds
 
-            compound = Compound(compound_id, compartment=compound_compartment)
-            yield compound, value
+
+def parse_reaction_equation(equation_def, default_compartment):
+    """Parse a structured reaction equation as obtained from a YAML file
+
+    Returns a Reaction.
+    """
 
     if isinstance(equation_def, string_types):
         return parse_reaction_equation_string(
             equation_def, default_compartment)
     else:
-        compartment = equation_def.get('compartment', default_compartment)
-        reversible = bool(equation_def.get('reversible', True))
-        left = equation_def.get('left', [])
-        right = equation_def.get('right', [])
-        if len(left) == 0 and len(right) == 0:
+        get = equation_def.get
+        compartment = get('compartment', default_compartment)
+        reversible = get('reversible', True)
+        left = get('left')
+        right = get('right')
+        if not left and not right:
             raise ParseError('Reaction values are missing')
 
-        return Reaction(Direction.Both if reversible else Direction.Forward,
-                        parse_compound_list(left, compartment),
-                        parse_compound_list(right, compartment))
+        return Reaction(
+            Direction.Both if reversible else Direction.Forward,
+            _parse_reaction_compound_list(left or (), compartment),
+            _parse_reaction_compound_list(right or (), compartment))
 
 
 def parse_reaction(reaction_def, default_compartment, context=None):
@@ -842,6 +1145,8 @@ def parse_reaction_list(path, reactions, default_compartment=None):
 
     context = FilePathContext(path)
 
+    _prefetch_include_files(context, reactions)
+
     for reaction_def in reactions:
         if 'include' in reaction_def:
             include_context = context.resolve(reaction_def['include'])
@@ -870,17 +1175,30 @@ def parse_reaction_table_file(path, f, default_compartment):
 
     context = FilePathContext(path)
 
-    for lineno, row in enumerate(csv.DictReader(f, delimiter=str('\t'))):
-        if 'id' not in row or row['id'].strip() == '':
-            raise ParseError('Expected `id` column in table')
+    # Same manual header/split loop as parse_compound_table_file; avoids
+    # the per-row dict and column state of csv.DictReader.
+    header = None
+    for lineno, line in enumerate(f):
+        line = line.rstrip('\r\n')
+        if line == '':
+            continue
 
-        props = {key: value for key, value in iteritems(row) if value != ''}
+        fields = line.split('\t')
+        if header is None:
+            header = fields
+            continue
+
+        props = {key: value for key, value in zip(header, fields)
+                 if value != ''}
+
+        if props.get('id', '').strip() == '':
+            raise ParseError('Expected `id` column in table')
 
         if 'equation' in props:
             props['equation'] = parse_reaction_equation_string(
                 props['equation'], default_compartment)
 
-        mark = FileMark(context, lineno + 2, 0)
+        mark = FileMark(context, lineno + 1, 0)
         yield ReactionEntry(props, mark)
 
 
@@ -892,6 +1210,16 @@ def parse_reaction_file(path, default_compartment=None):
 
     context = FilePathContext(path)
 
+    for reaction in _cached_file_entries(
+            ('reaction', default_compartment), context,
+            lambda: _parse_reaction_file_entries(
+                context, default_compartment)):
+        yield reaction
+
+
+def _parse_reaction_file_entries(context, default_compartment):
+    """Parse entries of a reaction file (uncached)."""
+
     format = resolve_format(None, context.filepath)
     if format == 'tsv':
         logger.debug('Parsing reaction file {} as TSV'.format(
@@ -903,10 +1231,71 @@ def parse_reaction_file(path, default_compartment=None):
     elif format == 'yaml':
         logger.debug('Parsing reaction file {} as YAML'.format(
             context.filepath))
+        for reaction in parse_reaction_list(
+                context, _load_yaml_file(context), default_compartment):
+            yield reaction
+    else:
+        raise ParseError('Unable to detect format of reaction file {}'.format(
+            context.filepath))
+
+
+def parse_reaction_id_list(path, reactions):
+    """Parse a structured list of reactions, yielding only reaction IDs.
+
+    This skips parsing of equations and other properties. Path can be given
+    as a string or a context.
+    """
+
+    context = FilePathContext(path)
+
+    _prefetch_include_files(context, reactions)
+
+    for reaction_def in reactions:
+        if 'include' in reaction_def:
+            include_context = context.resolve(reaction_def['include'])
+            for reaction_id in parse_reaction_id_file(include_context):
+                yield reaction_id
+        else:
+            reaction_id = reaction_def.get('id')
+            _check_id(reaction_id, 'Reaction')
+            yield reaction_id
+
+
+def parse_reaction_id_file(path):
+    """Yield reaction IDs of a reaction file without parsing the entries.
+
+    Only the id column (TSV) or id key (YAML) is extracted from each
+    reaction definition; equations are never parsed. Path can be given as a
+    string or a context.
+    """
+
+    context = FilePathContext(path)
+
+    format = resolve_format(None, context.filepath)
+    if format == 'tsv':
         with context.open('r') as f:
-            for reaction in parse_reaction_yaml_file(
-                    context, f, default_compartment):
-                yield reaction
+            header = None
+            for line in f:
+                line = line.rstrip('\r\n')
+                if line == '':
+                    continue
+
+                fields = line.split('\t')
+                if header is None:
+                    header = fields
+                    if 'id' not in header:
+                        raise ParseError('Expected `id` column in table')
+                    id_index = header.index('id')
+                    continue
+
+                if id_index >= len(fields) or fields[id_index].strip() == '':
+                    raise ParseError('Expected `id` column in table')
+
+                yield fields[id_index]
+    elif format == 'yaml':
+        for reaction_id in parse_reaction_id_list(
+                context, _load_yaml_file(context)):
+            yield reaction_id
     else:
         raise ParseError('Unable to detect format of reaction file {}'.format(
             context.filepath))
@@ -1005,9 +1394,8 @@ def parse_exchange_table_file(f):
     optional and contains the upper flux limit.
     """
 
-    for line in f:
-        line, _, comment = line.partition('#')
-        line = line.strip()
+    for match in _TABLE_LINE_RE.finditer(f.read()):
+        line = match.group(1)
         if line == '':
             continue
 
@@ -1045,6 +1433,16 @@ def parse_exchange_file(path, default_compartment):
 
     context = FilePathContext(path)
 
+    for entry in _cached_file_entries(
+            ('exchange', default_compartment), context,
+            lambda: _parse_exchange_file_entries(
+                context, default_compartment)):
+        yield entry
+
+
+def _parse_exchange_file_entries(context, default_compartment):
+    """Parse entries of an exchange file (uncached)."""
+
     format = resolve_format(None, context.filepath)
     if format == 'tsv':
         logger.debug('Parsing exchange file {} as TSV'.format(
@@ -1055,10 +1453,9 @@ def parse_exchange_file(path, default_compartment):
     elif format == 'yaml':
         logger.debug('Parsing exchange file {} as YAML'.format(
             context.filepath))
-        with context.open('r') as f:
-            for entry in parse_exchange_yaml_file(
-                    context, f, default_compartment):
-                yield entry
+        for entry in parse_exchange(
+                _load_yaml_file(context), default_compartment):
+            yield entry
     else:
         raise ParseError('Unable to detect format of exchange file {}'.format(
             context.filepath))
@@ -1102,6 +1499,46 @@ def parse_limits_list(path, limits):
             yield parse_limit(limit_def)
 
 
+# Limits tables at least this large are parsed with pandas, which converts
+# floats in C; for small files the per-line loop is faster than the import
+# and setup cost.
+_LIMITS_TABLE_FAST_SIZE = 65536
+
+
+def _parse_limits_table_fast(data):
+    """Parse a limits table with pandas, returning a list of limit tuples.
+
+    Returns None if the table cannot be parsed this way; the caller then
+    falls back to the per-line parser.
+    """
+    import pandas
+
+    try:
+        # Keep reaction IDs as strings (an all-numeric column would
+        # otherwise be parsed as ints) and let only '-' mean a missing
+        # limit, matching the per-line parser.
+        frame = pandas.read_csv(
+            StringIO(data), sep=r'\s+', comment='#', header=None,
+            names=['reaction', 'lower', 'upper'],
+            dtype={'reaction': str},
+            keep_default_na=False, na_values=['-'])
+    except Exception:
+        return None
+
+    def limit_value(value):
+        # Missing trailing fields are read as empty strings when the
+        # default NA handling is disabled.
+        if value == '' or pandas.isna(value):
+            return None
+        return float(value)
+
+    limits = []
+    for row in frame.itertuples(index=False):
+        limits.append(
+            (row.reaction, limit_value(row.lower), limit_value(row.upper)))
+    return limits
+
+
 def parse_limits_table_file(f):
     """Parse a space-separated file containing reaction flux limits
 
@@ -1110,9 +1547,17 @@ def parse_limits_table_file(f):
     upper flux limit.
     """
 
-    for line in f:
-        line, _, comment = line.partition('#')
-        line = line.strip()
+    data = f.read()
+
+    if len(data) >= _LIMITS_TABLE_FAST_SIZE:
+        limits = _parse_limits_table_fast(data)
+        if limits is not None:
+            for limit in limits:
+                yield limit
+            return
+
+    for match in _TABLE_LINE_RE.finditer(data):
+        line = match.group(1)
         if line == '':
             continue
 
@@ -1150,6 +1595,15 @@ def parse_limits_file(path):
 
     context = FilePathContext(path)
 
+    for limit in _cached_file_entries(
+            ('limits',), context,
+            lambda: _parse_limits_file_entries(context)):
+        yield limit
+
+
+def _parse_limits_file_entries(context):
+    """Parse entries of a limits file (uncached)."""
+
     format = resolve_format(None, context.filepath)
     if format == 'tsv':
         logger.debug('Parsing limits file {} as TSV'.format(
@@ -1160,9 +1614,8 @@ def parse_limits_file(path):
     elif format == 'yaml':
         logger.debug('Parsing limits file {} as YAML'.format(
             context.filepath))
-        with context.open('r') as f:
-            for limit in parse_limits_yaml_file(context, f):
-                yield limit
+        for limit in parse_limits_list(context, _load_yaml_file(context)):
+            yield limit
     else:
         raise ParseError('Unable to detect format of limits file {}'.format(
             context.filepath))
@@ -1216,13 +1669,13 @@ def parse_model_table_file(path, f):
     Yields reactions IDs. Path can be given as a string or a context.
     """
 
-    for line in f:
-        line, _, comment = line.partition('#')
-        line = line.strip()
-        if line == '':
-            continue
-
-        yield line
+    # The format is a bare reaction ID per line, so a direct comment slice
+    # per line beats the shared table-line regex here.
+    for raw in f.read().split('\n'):
+        hash_index = raw.find('#')
+        line = (raw if hash_index < 0 else raw[:hash_index]).strip()
+        if line:
+            yield line
 
 
 def parse_model_file(path):
@@ -1235,6 +1688,15 @@ def parse_model_file(path):
 
     context = FilePathContext(path)
 
+    for reaction_id in _cached_file_entries(
+            ('model',), context,
+            lambda: _parse_model_file_entries(context)):
+        yield reaction_id
+
+
+def _parse_model_file_entries(context):
+    """Parse entries of a model file (uncached)."""
+
     format = resolve_format(None, context.filepath)
     if format == 'tsv':
         logger.debug('Parsing model file {} as TSV'.format(context.filepath))
@@ -1243,9 +1705,9 @@ def parse_model_file(path):
                 yield reaction_id
     elif format == 'yaml':
         logger.debug('Parsing model file {} as YAML'.format(context.filepath))
-        with context.open('r') as f:
-            for reaction_id in parse_model_yaml_file(context, f):
-                yield reaction_id
+        for reaction_id in parse_model_group_list(
+                context, _load_yaml_file(context)):
+            yield reaction_id
 
 
 # Threshold for converting reactions into dictionary representation.
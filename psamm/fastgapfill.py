@@ -31,7 +31,7 @@ from .fastcore import fastcore
 logger = logging.getLogger(__name__)
 
 
-def fastgapfill(model_extended, core, solver, weights={}, epsilon=1e-5):
+def fastgapfill(model_extended, core, solver, weights=None, epsilon=1e-5):
     """Run FastGapFill gap-filling algorithm by calling
     :func:`psamm.fastcore.fastcore`.
 
@@ -49,6 +49,9 @@ def fastgapfill(model_extended, core, solver, weights={}, epsilon=1e-5):
         epsilon: float number, threshold for Fastcore algorithm.
     """
 
+    if weights is None:
+        weights = {}
+
     # Run Fastcore and print the induced reaction set
     logger.info('Calculating Fastcore induced set on model')
     induced = fastcore(
@@ -29,8 +29,6 @@ from __future__ import unicode_literals
 
 import logging
 
-from six import iteritems
-
 from .metabolicmodel import create_exchange_id, create_transport_id
 from .reaction import Reaction, Direction
 
@@ -185,9 +183,10 @@ def create_extended_model(model, db_penalty=None, ex_penalty=None,
 
     # Add database reactions to extended model
     if len(compartment_ids) > 0:
-        logger.info(
-            'Using all database reactions in compartments: {}...'.format(
-                ', '.join('{}'.format(c) for c in compartment_ids)))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Using all database reactions in compartments: {}...'.format(
+                    ', '.join('{}'.format(c) for c in compartment_ids)))
         db_added = add_all_database_reactions(model_extended, compartment_ids)
     else:
         logger.warning(
@@ -206,10 +205,12 @@ def create_extended_model(model, db_penalty=None, ex_penalty=None,
     # Add transport reactions to extended model
     boundaries = model.compartment_boundaries
     if len(boundaries) > 0:
-        logger.info(
-            'Using artificial transport reactions for the compartment'
-            ' boundaries: {}...'.format(
-                '; '.join('{}<->{}'.format(c1, c2) for c1, c2 in boundaries)))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                'Using artificial transport reactions for the compartment'
+                ' boundaries: {}...'.format(
+                    '; '.join('{}<->{}'.format(c1, c2)
+                              for c1, c2 in boundaries)))
         tp_added = add_all_transport_reactions(
             model_extended, boundaries, allow_duplicates=True)
     else:
@@ -219,21 +220,13 @@ def create_extended_model(model, db_penalty=None, ex_penalty=None,
         tp_added = set()
 
     # Add penalty weights on reactions
-    weights = {}
-    if db_penalty is not None:
-        weights.update((rxnid, db_penalty) for rxnid in db_added)
-    else:
-        weights.update((rxnid, 1) for rxnid in db_added)
-    if tp_penalty is not None:
-        weights.update((rxnid, tp_penalty) for rxnid in tp_added)
-    else:
-        weights.update((rxnid, 1) for rxnid in tp_added)
-    if ex_penalty is not None:
-        weights.update((rxnid, ex_penalty) for rxnid in ex_added)
-    else:
-        weights.update((rxnid, 1) for rxnid in ex_added)
+    weights = dict.fromkeys(
+        db_added, db_penalty if db_penalty is not None else 1)
+    weights.update(dict.fromkeys(
+        tp_added, tp_penalty if tp_penalty is not None else 1))
+    weights.update(dict.fromkeys(
+        ex_added, ex_penalty if ex_penalty is not None else 1))
 
     if penalties is not None:
-        for rxnid, penalty in iteritems(penalties):
-            weights[rxnid] = penalty
+        weights.update(penalties)
     return model_extended, weights
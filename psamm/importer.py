@@ -448,6 +448,19 @@ def count_genes(model):
     return len(genes)
 
 
+def _dir_is_empty(path):
+    """Return True if the directory at path contains no entries.
+
+    Uses :func:`os.scandir` when available so the check stops at the first
+    entry instead of materializing the full directory listing.
+    """
+    if hasattr(os, 'scandir'):
+        for _ in os.scandir(path):
+            return False
+        return True
+    return len(os.listdir(path)) == 0
+
+
 def write_yaml_model(model, dest='.', convert_exchange=True,
                      split_subsystem=True):
     """Write the given NativeModel to YAML files in dest folder.
@@ -686,7 +699,7 @@ def main(importer_class=None, args=None):
     # directory does not exist.
     dest_is_empty = False
     try:
-        dest_is_empty = len(os.listdir(args.dest)) == 0
+        dest_is_empty = _dir_is_empty(args.dest)
     except OSError:
         dest_is_empty = True
 
@@ -799,7 +812,7 @@ def main_bigg(args=None, urlopen=urlopen):
     # directory does not exist.
     dest_is_empty = False
     try:
-        dest_is_empty = len(os.listdir(args.dest)) == 0
+        dest_is_empty = _dir_is_empty(args.dest)
     except OSError:
         dest_is_empty = True
 
@@ -272,10 +272,18 @@ class MetabolicModel(MetabolicDatabase):
                    for other_reaction in reactions):
                 self._compound_set.remove(compound)
 
-    def copy(self):
-        """Return copy of model"""
+    def copy(self, copy_database=False):
+        """Return copy of model.
+
+        By default the copy shares the underlying reaction database with
+        this model. Set ``copy_database`` to True to copy the database as
+        well, so that reactions added to either database (e.g. through
+        :meth:`DictDatabase.set_reaction <psamm.database.DictDatabase.\
+set_reaction>`) are not visible in the other model.
+        """
 
-        model = self.__class__(self._database)
+        database = self._database.copy() if copy_database else self._database
+        model = self.__class__(database, v_max=self._v_max)
         model._limits_lower = dict(self._limits_lower)
         model._limits_upper = dict(self._limits_upper)
         model._reaction_set = set(self._reaction_set)
@@ -489,6 +489,52 @@ class TestYAMLFileSystemData(unittest.TestCase):
         self.assertEqual(reactions[1].filemark.filecontext.filepath, path)
         self.assertEqual(reactions[1].filemark.line, 3)
 
+    def test_parse_compound_id_file(self):
+        self.write_model_file('included.tsv', '\n'.join([
+            'id\tname',
+            'h2o\tWater'
+        ]))
+        path = self.write_model_file('compounds.yaml', '\n'.join([
+            '- id: atp',
+            '  name: ATP',
+            '- include: included.tsv'
+        ]))
+
+        compound_ids = list(native.parse_compound_id_file(path, None))
+        self.assertEqual(compound_ids, ['atp', 'h2o'])
+
+    def test_parse_compound_ids(self):
+        model = native.ModelReader({
+            'compounds': [
+                {'id': 'atp', 'name': 'ATP'},
+                {'id': 'h2o'}
+            ]
+        })
+        self.assertEqual(list(model.parse_compound_ids()), ['atp', 'h2o'])
+
+    def test_parse_reaction_id_file(self):
+        self.write_model_file('included.tsv', '\n'.join([
+            'id\tname\tequation',
+            'rxn_2\tSecond reaction\t<=> |C|'
+        ]))
+        path = self.write_model_file('reactions.yaml', '\n'.join([
+            '- id: rxn_1',
+            '  equation: "|A| => |B|"',
+            '- include: included.tsv'
+        ]))
+
+        reaction_ids = list(native.parse_reaction_id_file(path))
+        self.assertEqual(reaction_ids, ['rxn_1', 'rxn_2'])
+
+    def test_parse_reaction_ids(self):
+        model = native.ModelReader({
+            'reactions': [
+                {'id': 'rxn_1', 'equation': '|A| => |B|'},
+                {'id': 'rxn_2'}
+            ]
+        })
+        self.assertEqual(list(model.parse_reaction_ids()), ['rxn_1', 'rxn_2'])
+
     def test_parse_reaction_yaml_file(self):
         path = self.write_model_file('reaction.yaml', '\n'.join([
             '- id: rxn_1',
@@ -605,6 +651,24 @@ class TestYAMLFileSystemData(unittest.TestCase):
         self.assertAlmostEqual(limits[2][2], 3e-1)
         self.assertEqual(limits[3], ('rxn_4', -1000, -100))
 
+    def test_parse_limits_table_fast(self):
+        table = '\n'.join([
+            '# comment',
+            '',
+            'rxn_1',
+            'rxn_2\t-100',
+            'rxn_3\t-\t3e-1',
+            'rxn_4\t-1000\t-100  # line comment'
+        ])
+
+        limits = native._parse_limits_table_fast(table)
+        self.assertEqual(limits[0], ('rxn_1', None, None))
+        self.assertEqual(limits[1], ('rxn_2', -100, None))
+        self.assertEqual(limits[2][0], 'rxn_3')
+        self.assertEqual(limits[2][1], None)
+        self.assertAlmostEqual(limits[2][2], 3e-1)
+        self.assertEqual(limits[3], ('rxn_4', -1000, -100))
+
     def test_parse_limits_table_file_too_many_fields(self):
         path = self.write_model_file('limits.tsv', '\n'.join([
             'rxn_1\t-\t100\ttext']))